@@ -0,0 +1,193 @@
+from fastapi import HTTPException, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.encoders import jsonable_encoder
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+import os
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional
+from collections import OrderedDict
+import hashlib
+import time
+from datetime import datetime, timedelta
+import jwt
+from passlib.context import CryptContext
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from models import User
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# MongoDB connection
+mongo_url = os.environ['MONGO_URL']
+# zstd compresses large book descriptions on the wire (zlib if zstandard is missing)
+client = AsyncIOMotorClient(
+    mongo_url,
+    compressors="zstd,zlib",
+    maxPoolSize=200,
+    minPoolSize=20,
+    serverSelectionTimeoutMS=2000
+)
+db = client[os.environ['DB_NAME']]
+
+# Redis response cache for public catalog reads (disabled when REDIS_URL is unset)
+redis_url = os.environ.get('REDIS_URL')
+# Short timeouts so an unreachable Redis falls through to Mongo instead of stalling
+redis_client = aioredis.from_url(
+    redis_url,
+    socket_connect_timeout=0.3,
+    socket_timeout=0.3
+) if redis_url else None
+RESPONSE_CACHE_PREFIX = "bookverse:"
+RESPONSE_CACHE_TTL = 60
+# Bumped on every catalog mutation; cache keys embed it so a read that raced a
+# mutation stores its body under a generation no one reads anymore
+RESPONSE_CACHE_GENERATION_KEY = RESPONSE_CACHE_PREFIX + "generation"
+
+# JWT Settings
+# Tokens are signed with Ed25519 when JWT_PRIVATE_KEY (PEM) is set,
+# otherwise fall back to HS256 with JWT_SECRET
+JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-here')
+JWT_PRIVATE_KEY = os.environ.get('JWT_PRIVATE_KEY')
+if JWT_PRIVATE_KEY:
+    JWT_ALGORITHM = "EdDSA"
+    JWT_SIGNING_KEY = load_pem_private_key(JWT_PRIVATE_KEY.encode(), password=None)
+    if not isinstance(JWT_SIGNING_KEY, Ed25519PrivateKey):
+        raise RuntimeError("JWT_PRIVATE_KEY must be an Ed25519 private key in PEM format")
+    JWT_VERIFY_KEY = JWT_SIGNING_KEY.public_key()
+else:
+    JWT_ALGORITHM = "HS256"
+    JWT_SIGNING_KEY = JWT_VERIFY_KEY = JWT_SECRET
+JWT_EXPIRATION_HOURS = 24
+
+# Verified-token cache (opt-in, disabled when JWT_CACHE_TTL is unset or 0)
+JWT_CACHE_TTL = min(float(os.environ.get('JWT_CACHE_TTL', '0')), 10.0)
+JWT_CACHE_MAXSIZE = 10000
+
+# Password hashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=10)
+
+# Precomputed bcrypt hash for the seeded admin account, override per deployment
+DEFAULT_ADMIN_HASH = os.environ.get('DEFAULT_ADMIN_HASH') or "$2b$10$Nc.nJc3PPNhHLTjhOIAzUuv31kORR42wkSbCTVFklcIpnJqSPKgr."
+
+# Security
+security = HTTPBearer()
+
+# Create uploads directory
+uploads_dir = ROOT_DIR / "uploads"
+uploads_dir.mkdir(exist_ok=True)
+
+# Maps sha256(token) -> (expires_at, User), oldest entries first
+_token_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+# Auth utilities
+# bcrypt is CPU-bound, so run it in a worker thread to keep the event loop free
+async def hash_password(password: str) -> str:
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+
+def create_access_token(data: dict):
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, JWT_SIGNING_KEY, algorithm=JWT_ALGORITHM)
+    return encoded_jwt
+
+def get_cached_user(cache_key: bytes) -> Optional[User]:
+    entry = _token_cache.get(cache_key)
+    if entry is None:
+        return None
+    expires_at, user = entry
+    if expires_at <= time.time():
+        del _token_cache[cache_key]
+        return None
+    _token_cache.move_to_end(cache_key)
+    return user
+
+def cache_user(cache_key: bytes, user: User, token_exp: Optional[float]):
+    now = time.time()
+    expires_at = now + JWT_CACHE_TTL
+    if token_exp is not None:
+        # Never honor a cached token past its own expiry
+        expires_at = min(expires_at, float(token_exp))
+    if expires_at <= now:
+        return
+    _token_cache[cache_key] = (expires_at, user)
+    _token_cache.move_to_end(cache_key)
+    while len(_token_cache) > JWT_CACHE_MAXSIZE:
+        _token_cache.popitem(last=False)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    try:
+        token = credentials.credentials
+        cache_key = None
+        if JWT_CACHE_TTL > 0:
+            cache_key = hashlib.sha256(token.encode()).digest()
+            cached_user = get_cached_user(cache_key)
+            if cached_user is not None:
+                return cached_user
+        
+        payload = jwt.decode(token, JWT_VERIFY_KEY, algorithms=[JWT_ALGORITHM])
+        email: str = payload.get("sub")
+        if email is None:
+            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+        
+        user_data = await db.users.find_one({"email": email})
+        if user_data is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        
+        user = User(**user_data)
+        if cache_key is not None:
+            cache_user(cache_key, user, payload.get("exp"))
+        return user
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+
+async def get_admin_user(current_user: User = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+# Response cache utilities
+async def get_cached_response(key: str) -> tuple:
+    """Return (cached response or None, key to store a fresh response under)."""
+    if redis_client is None:
+        return None, None
+    try:
+        generation = await redis_client.get(RESPONSE_CACHE_GENERATION_KEY) or b"0"
+        cache_key = f"{RESPONSE_CACHE_PREFIX}{key}:{generation.decode()}"
+        cached = await redis_client.get(cache_key)
+    except RedisError as e:
+        logger.warning(f"Response cache read failed: {e}")
+        return None, None
+    if cached is None:
+        return None, cache_key
+    return Response(content=cached, media_type="application/json"), cache_key
+
+async def cache_response(cache_key: Optional[str], content) -> ORJSONResponse:
+    response = ORJSONResponse(jsonable_encoder(content))
+    if redis_client is not None and cache_key is not None:
+        try:
+            await redis_client.set(cache_key, response.body, ex=RESPONSE_CACHE_TTL, nx=True)
+        except RedisError as e:
+            logger.warning(f"Response cache write failed: {e}")
+    return response
+
+async def clear_response_cache():
+    if redis_client is None:
+        return
+    try:
+        # Entries under older generations are never read again and expire via TTL
+        await redis_client.incr(RESPONSE_CACHE_GENERATION_KEY)
+    except RedisError as e:
+        logger.warning(f"Response cache invalidation failed: {e}")
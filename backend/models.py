@@ -0,0 +1,54 @@
+from pydantic import BaseModel, Field, EmailStr
+from typing import Optional
+import uuid
+from datetime import datetime
+
+# Models
+class User(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    email: EmailStr
+    name: str
+    role: str = "user"  # "user" or "admin"
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class UserCreate(BaseModel):
+    email: EmailStr
+    password: str
+    name: str
+    role: str = "user"
+
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+
+class Book(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    title: str
+    author: str
+    description: str
+    price: float
+    category: str
+    cover_image: Optional[str] = None
+    is_featured: bool = False
+    cta_button_text: str = "Buy Now"
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class BookCreate(BaseModel):
+    title: str
+    author: str
+    description: str
+    price: float
+    category: str
+    is_featured: bool = False
+    cta_button_text: str = "Buy Now"
+
+class BookUpdate(BaseModel):
+    title: Optional[str] = None
+    author: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    category: Optional[str] = None
+    is_featured: Optional[bool] = None
+    cta_button_text: Optional[str] = None
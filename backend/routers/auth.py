@@ -0,0 +1,60 @@
+from fastapi import APIRouter, HTTPException, Depends
+
+from deps import db, hash_password, verify_password, create_access_token, get_current_user
+from models import User, UserCreate, UserLogin
+
+router = APIRouter(prefix="/auth")
+
+@router.post("/register")
+async def register(user_data: UserCreate):
+    # Check if user already exists
+    existing_user = await db.users.find_one({"email": user_data.email})
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # Hash password
+    hashed_password = await hash_password(user_data.password)
+    
+    # Create user
+    user_dict = user_data.dict()
+    user_dict["password"] = hashed_password
+    user_obj = User(**{k: v for k, v in user_dict.items() if k != "password"})
+    
+    # Save to database
+    await db.users.insert_one({**user_obj.dict(), "password": hashed_password})
+    
+    # Create access token
+    access_token = create_access_token(data={"sub": user_obj.email})
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": user_obj
+    }
+
+@router.post("/login")
+async def login(user_data: UserLogin):
+    # Find user
+    user_record = await db.users.find_one({"email": user_data.email})
+    if not user_record:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    
+    # Verify password
+    if not await verify_password(user_data.password, user_record["password"]):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    
+    # Create user object
+    user_obj = User(**{k: v for k, v in user_record.items() if k != "password"})
+    
+    # Create access token
+    access_token = create_access_token(data={"sub": user_obj.email})
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": user_obj
+    }
+
+@router.get("/me")
+async def get_me(current_user: User = Depends(get_current_user)):
+    return current_user
@@ -0,0 +1,258 @@
+from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Form, BackgroundTasks
+from pathlib import Path
+from typing import List, Optional
+import hashlib
+from datetime import datetime
+import os
+import uuid
+import time
+import asyncio
+import logging
+import aiofiles
+
+from deps import db, uploads_dir, get_admin_user, get_cached_response, cache_response, clear_response_cache
+from models import User, Book
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Fields returned for book listings; keeps _id and unknown fields off the wire
+BOOK_PROJECTION = {"_id": 0, **{field: 1 for field in Book.model_fields}}
+
+# Upload utilities
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+# Whole book form request: one cover image plus room for the text fields
+MAX_BOOK_REQUEST_SIZE = MAX_UPLOAD_SIZE + 64 * 1024
+ALLOWED_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp", "avif"}
+
+async def save_upload(upload: UploadFile) -> str:
+    file_extension = Path(upload.filename or "").suffix.lstrip(".").lower()
+    if file_extension not in ALLOWED_IMAGE_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Unsupported image type")
+    
+    # Stream to a temp file in chunks, hashing as we go
+    temp_path = uploads_dir / f".{uuid.uuid4().hex}.part"
+    size = 0
+    digest = hashlib.blake2b(digest_size=8)
+    try:
+        async with aiofiles.open(temp_path, "wb") as buffer:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_SIZE:
+                    raise HTTPException(status_code=413, detail="Image exceeds 5 MB limit")
+                digest.update(chunk)
+                await buffer.write(chunk)
+        
+        # Name files by content; the atomic rename means readers never see a partial image
+        filename = f"{digest.hexdigest()}.{file_extension}"
+        await asyncio.to_thread(os.replace, temp_path, uploads_dir / filename)
+    finally:
+        await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+    
+    return f"/uploads/{filename}"
+
+# Recently written uploads may belong to a book whose insert hasn't landed yet
+UPLOAD_REMOVAL_GRACE_SECONDS = 300
+
+async def is_upload_referenced(cover_image: str) -> bool:
+    return await db.books.find_one({"cover_image": cover_image}, projection={"_id": 1}) is not None
+
+async def remove_unused_upload(cover_image: Optional[str]):
+    # Uploads are content-addressed, so another book may still use the same file
+    if not cover_image or not cover_image.startswith("/uploads/"):
+        return
+    if await is_upload_referenced(cover_image):
+        return
+    file_path = uploads_dir / Path(cover_image).name
+    try:
+        # save_upload always replaces the file, so a concurrent upload of the same
+        # image shows up as a fresh mtime even before its book is inserted. Wait
+        # until the file has been untouched for the grace period, then re-check
+        while True:
+            stat = await asyncio.to_thread(file_path.stat)
+            remaining = UPLOAD_REMOVAL_GRACE_SECONDS - (time.time() - stat.st_mtime)
+            if remaining <= 0:
+                break
+            await asyncio.sleep(remaining)
+        # Re-check right before unlinking. An upload that replaces the file between
+        # this check and the unlink can still lose its image; that window is a
+        # single round trip wide and is accepted rather than adding a lock
+        if await is_upload_referenced(cover_image):
+            return
+        await asyncio.to_thread(file_path.unlink, missing_ok=True)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove upload {file_path}: {e}")
+
+# Book routes
+@router.get("/books", response_model=List[Book])
+async def get_books(category: Optional[str] = None, featured: Optional[bool] = None, search: Optional[str] = None):
+    filter_dict = {}
+    projection = BOOK_PROJECTION
+    sort_spec = [("created_at", -1)]
+    
+    if category:
+        filter_dict["category"] = category
+    if featured is not None:
+        filter_dict["is_featured"] = featured
+    if search:
+        # Served by the text index on title/author created at startup
+        filter_dict["$text"] = {"$search": search}
+        # Best matches first, newest first among equal scores
+        projection = {**BOOK_PROJECTION, "score": {"$meta": "textScore"}}
+        sort_spec = [("score", {"$meta": "textScore"})] + sort_spec
+    
+    # Only the unfiltered listing is cached
+    cache_key = None
+    if not filter_dict:
+        cached, cache_key = await get_cached_response("books")
+        if cached is not None:
+            return cached
+    
+    cursor = db.books.find(filter_dict, projection=projection).sort(sort_spec).limit(100)
+    # Documents come from our own collection, so skip re-validation
+    books = [Book.model_construct(**book) async for book in cursor]
+    if not filter_dict:
+        return await cache_response(cache_key, books)
+    return books
+
+@router.get("/books/{book_id}", response_model=Book)
+async def get_book(book_id: str):
+    book = await db.books.find_one({"id": book_id})
+    if not book:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return Book(**book)
+
+@router.post("/books", response_model=Book)
+async def create_book(
+    title: str = Form(...),
+    author: str = Form(...),
+    description: str = Form(...),
+    price: float = Form(...),
+    category: str = Form(...),
+    is_featured: bool = Form(False),
+    cta_button_text: str = Form("Buy Now"),
+    cover_image: Optional[UploadFile] = File(None),
+    current_user: User = Depends(get_admin_user)
+):
+    # Handle image upload
+    cover_image_path = None
+    if cover_image:
+        # Save uploaded file
+        cover_image_path = await save_upload(cover_image)
+    
+    # Create book
+    book_data = {
+        "title": title,
+        "author": author,
+        "description": description,
+        "price": price,
+        "category": category,
+        "is_featured": is_featured,
+        "cta_button_text": cta_button_text,
+        "cover_image": cover_image_path
+    }
+    
+    book_obj = Book(**book_data)
+    await db.books.insert_one(book_obj.dict())
+    await clear_response_cache()
+    
+    return book_obj
+
+@router.put("/books/{book_id}", response_model=Book)
+async def update_book(
+    book_id: str,
+    background_tasks: BackgroundTasks,
+    title: str = Form(None),
+    author: str = Form(None),
+    description: str = Form(None),
+    price: Optional[float] = Form(None),
+    category: str = Form(None),
+    is_featured: Optional[bool] = Form(None),
+    cta_button_text: str = Form(None),
+    cover_image: Optional[UploadFile] = File(None),
+    current_user: User = Depends(get_admin_user)
+):
+    # Find existing book
+    existing_book = await db.books.find_one({"id": book_id})
+    if not existing_book:
+        raise HTTPException(status_code=404, detail="Book not found")
+    
+    # Build update data
+    update_data = {}
+    if title is not None:
+        update_data["title"] = title
+    if author is not None:
+        update_data["author"] = author
+    if description is not None:
+        update_data["description"] = description
+    if price is not None:
+        update_data["price"] = price
+    if category is not None:
+        update_data["category"] = category
+    if is_featured is not None:
+        update_data["is_featured"] = is_featured
+    if cta_button_text is not None:
+        update_data["cta_button_text"] = cta_button_text
+    
+    # Handle image upload
+    if cover_image:
+        update_data["cover_image"] = await save_upload(cover_image)
+    
+    update_data["updated_at"] = datetime.utcnow()
+    
+    # Update book
+    await db.books.update_one({"id": book_id}, {"$set": update_data})
+    await clear_response_cache()
+    
+    # Drop the replaced cover image once the response is sent
+    if "cover_image" in update_data and update_data["cover_image"] != existing_book.get("cover_image"):
+        background_tasks.add_task(remove_unused_upload, existing_book.get("cover_image"))
+    
+    # Return updated book
+    updated_book = await db.books.find_one({"id": book_id})
+    return Book(**updated_book)
+
+@router.delete("/books/{book_id}")
+async def delete_book(book_id: str, background_tasks: BackgroundTasks, current_user: User = Depends(get_admin_user)):
+    deleted_book = await db.books.find_one_and_delete({"id": book_id}, projection={"cover_image": 1})
+    if deleted_book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    await clear_response_cache()
+    # Remove the cover image file once the response is sent
+    background_tasks.add_task(remove_unused_upload, deleted_book.get("cover_image"))
+    return {"message": "Book deleted successfully"}
+
+@router.get("/categories")
+async def get_categories():
+    cached, cache_key = await get_cached_response("categories")
+    if cached is not None:
+        return cached
+    categories = await db.books.distinct("category")
+    return await cache_response(cache_key, categories)
+
+@router.get("/home")
+async def get_home():
+    # Categories and featured books in a single aggregation round trip
+    pipeline = [
+        {"$facet": {
+            "categories": [
+                {"$group": {"_id": "$category"}},
+                {"$sort": {"_id": 1}}
+            ],
+            "featured": [
+                {"$match": {"is_featured": True}},
+                {"$sort": {"created_at": -1}},
+                {"$limit": 20},
+                {"$project": BOOK_PROJECTION}
+            ]
+        }}
+    ]
+    result = (await db.books.aggregate(pipeline).to_list(1))[0]
+    return {
+        "categories": [group["_id"] for group in result["categories"]],
+        "featured": [Book.model_construct(**book) for book in result["featured"]]
+    }
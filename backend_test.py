@@ -13,6 +13,8 @@ class BookVerseAPITester:
         self.tests_passed = 0
         self.created_book_id = None
         self.created_user_email = None
+        # Reuse one keep-alive connection across all tests
+        self.session = requests.Session()
 
     def run_test(self, name, method, endpoint, expected_status, data=None, token=None, files=None):
         """Run a single API test"""
@@ -32,19 +34,19 @@ class BookVerseAPITester:
         
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
             elif method == 'POST':
                 if files:
-                    response = requests.post(url, data=data, files=files, headers=headers)
+                    response = self.session.post(url, data=data, files=files, headers=headers)
                 else:
-                    response = requests.post(url, json=data, headers=headers)
+                    response = self.session.post(url, json=data, headers=headers)
             elif method == 'PUT':
                 if files:
-                    response = requests.put(url, data=data, files=files, headers=headers)
+                    response = self.session.put(url, data=data, files=files, headers=headers)
                 else:
-                    response = requests.put(url, json=data, headers=headers)
+                    response = self.session.put(url, json=data, headers=headers)
             elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
+                response = self.session.delete(url, headers=headers)
 
             success = response.status_code == expected_status
             if success:
@@ -205,6 +207,62 @@ class BookVerseAPITester:
         if success and isinstance(response, list):
             print(f"   Found categories: {response}")
 
+    def test_home_endpoint(self):
+        """Test combined home endpoint"""
+        print("\n" + "="*50)
+        print("TESTING HOME ENDPOINT")
+        print("="*50)
+        
+        success, response = self.run_test(
+            "Get Home",
+            "GET",
+            "home",
+            200
+        )
+        
+        if success and isinstance(response, dict):
+            categories = response.get("categories", [])
+            featured = response.get("featured", [])
+            print(f"   Found {len(categories)} categories, {len(featured)} featured books")
+            if len(featured) > 20 or not all(book.get("is_featured") for book in featured):
+                print("   ⚠️  Featured list should hold at most 20 featured books")
+
+    def test_upload_validation(self):
+        """Test cover image upload rejections (admin only)"""
+        print("\n" + "="*50)
+        print("TESTING UPLOAD VALIDATION")
+        print("="*50)
+        
+        book_data = {
+            "title": "Upload Validation Book",
+            "author": "Test Author",
+            "description": "This book should never be created",
+            "price": "9.99",
+            "category": "Technology"
+        }
+        
+        # Test unsupported file extension (should fail)
+        self.run_test(
+            "Create Book (Unsupported Image Type) - Should Fail",
+            "POST",
+            "books",
+            400,
+            data=book_data,
+            token=self.admin_token,
+            files={"cover_image": ("cover.svg", b"<svg></svg>", "image/svg+xml")}
+        )
+        
+        # Test image over the 5 MB limit (should fail)
+        self.run_test(
+            "Create Book (Oversized Image) - Should Fail",
+            "POST",
+            "books",
+            413,
+            data=book_data,
+            token=self.admin_token,
+            files={"cover_image": ("cover.png", b"0" * (6 * 1024 * 1024), "image/png")}
+        )
+
     def test_book_crud_operations(self):
         """Test book CRUD operations (admin only)"""
         print("\n" + "="*50)
@@ -387,7 +445,9 @@ def main():
         # Book and category tests
         tester.test_books_endpoints()
         tester.test_categories_endpoint()
+        tester.test_home_endpoint()
         tester.test_book_crud_operations()
+        tester.test_upload_validation()
         
         # Security tests
         tester.test_unauthorized_access()